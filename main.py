@@ -1,23 +1,86 @@
 import os
+import json
+import stat
+import tempfile
 import yaml
 import logging.config
 import asyncio
 from loguru import logger
 
-from src import fetcher, filter, notifier, storage
+try:
+    # Use the libyaml-based C parser when PyYAML was built with it
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Heavier modules (fetcher, filter, notifier) are imported in main() only when needed.
+from src import storage
 
 # --- Configuration and Logging Setup ---
 
 # Define the project root directory as the directory containing this script.
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 
+def load_yaml_cached(path):
+    """
+    Loads a YAML file, reusing a JSON sidecar cache when it is up to date.
+
+    The parsed YAML is written to '<path>.cache.json' together with the YAML's
+    modification time and size. On later runs the cache is read instead of the
+    YAML only if both still match exactly, so a replaced file is picked up even
+    when it carries an older timestamp.
+    """
+    cache_path = path + '.cache.json'
+    # Stat before parsing so a YAML edited mid-read is reparsed on the next run
+    yaml_stat = os.stat(path)
+    stamp = {'mtime_ns': yaml_stat.st_mtime_ns, 'size': yaml_stat.st_size}
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('source') == stamp:
+            return cached['data']
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass  # Missing, stale-format or unreadable cache, fall back to parsing the YAML
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=SafeLoader)
+
+    tmp_path = None
+    try:
+        serialized = json.dumps({'source': stamp, 'data': data}, ensure_ascii=False)
+        # JSON turns non-string keys into strings, so only cache documents that round-trip unchanged
+        if json.loads(serialized)['data'] != data:
+            logger.debug(f"Not caching '{path}': its contents do not round-trip through JSON.")
+            return data
+        # Write to a temp file with the YAML's permissions (the config holds secrets),
+        # then atomically replace the cache so concurrent runs never see a partial file.
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(cache_path),
+            prefix='.' + os.path.basename(cache_path) + '.',
+            suffix='.tmp',
+        )
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            os.fchmod(f.fileno(), stat.S_IMODE(yaml_stat.st_mode))
+            f.write(serialized)
+        os.replace(tmp_path, cache_path)
+        tmp_path = None
+    except (OSError, TypeError) as e:
+        logger.warning(f"Could not write config cache '{cache_path}': {e}")
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return data
+
 def setup_logging():
     """Sets up logging using the logging.yaml configuration."""
     try:
         log_config_path = os.path.join(PROJECT_ROOT, 'config', 'logging.yaml')
         if os.path.exists(log_config_path):
-            with open(log_config_path, 'rt') as f:
-                config = yaml.safe_load(f.read())
+            config = load_yaml_cached(log_config_path)
             
             # Ensure the log file path is absolute
             if 'file' in config.get('handlers', {}):
@@ -41,8 +104,7 @@ def load_config():
     """Loads the main configuration from config.yaml."""
     try:
         config_path = os.path.join(PROJECT_ROOT, 'config', 'config.yaml')
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = load_yaml_cached(config_path)
         logger.info("Configuration loaded from config.yaml")
         return config
     except FileNotFoundError:
@@ -78,27 +140,55 @@ async def main():
             return
 
         logger.info(f"Fetching news for keywords: {search_keywords}")
-        loop = asyncio.get_running_loop()
-        for keyword in search_keywords:
-            # Run the synchronous `fetch_news` in a separate thread to avoid blocking
-            news_for_keyword = await loop.run_in_executor(
-                None,  # Use the default thread pool executor
-                fetcher.fetch_news,
-                naver_conf['client_id'],
-                naver_conf['client_secret'],
-                keyword
-            )
-            if news_for_keyword:
+        from src import fetcher
+
+        limiter = fetcher.NaverRateLimiter()
+        async with fetcher.create_session() as session:
+            # Fetch all keywords concurrently; the limiter caps in-flight requests
+            tasks = [
+                fetcher.fetch_news(
+                    session,
+                    limiter,
+                    naver_conf['client_id'],
+                    naver_conf['client_secret'],
+                    keyword
+                )
+                for keyword in search_keywords
+            ]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        fetch_failed = False
+        for keyword, news_for_keyword in zip(search_keywords, results):
+            if isinstance(news_for_keyword, Exception):
+                logger.error(f"Failed to fetch news for keyword '{keyword}': {news_for_keyword}")
+                fetch_failed = True
+            elif news_for_keyword is None:
+                fetch_failed = True
+            elif news_for_keyword:
                 all_news_items.extend(news_for_keyword)
-            
-            # Add a delay to avoid hitting API rate limits
-            await asyncio.sleep(0.2)
         
         if not all_news_items:
             logger.info("No news items fetched from Naver API. Exiting.")
             return
+
+        # The same article often matches several keywords; keep the first occurrence
+        unique_items = {}
+        for item in all_news_items:
+            unique_items.setdefault(item.link, item)
+        if len(unique_items) < len(all_news_items):
+            logger.info(f"Removed {len(all_news_items) - len(unique_items)} duplicate news items across keywords.")
+        all_news_items = list(unique_items.values())
+
+        # Mark already-sent articles that Naver still returns as seen, so they are not
+        # pruned and re-sent later. Prune only after a complete fetch, since a failed
+        # keyword's articles could not be marked.
+        storage.touch_sent_links(unique_items)
+        if not fetch_failed:
+            storage.prune_sent_links()
             
         # 3. Filter the collected news
+        from src import filter
+
         filtered_news = filter.filter_news(
             news_items=all_news_items,
             include_keywords=filter_conf.get('keywords', []),
@@ -112,37 +202,70 @@ async def main():
             
         logger.info(f"{len(filtered_news)} news items remaining after filtering. Checking against database...")
         
-        new_articles_sent = 0
-        # Process older items first to send them in chronological order
-        for item in reversed(filtered_news): 
-            link = item['link']
-            
-            # 5. Check for duplicates
-            if not storage.is_link_sent(link):
-                clean_title = item['title'].replace('<b>', '').replace('</b>', '')
-                logger.info(f"New article found: '{clean_title}'. Sending notification...")
-                
-                # 6. Send notification
-                await notifier.send_notification(
-                    bot_token=telegram_conf['bot_token'],
-                    chat_id=telegram_conf['chat_id'],
-                    news_item=item,
-                    keyword=item.get('keyword') # Pass the keyword for highlighting
-                )
-                
-                # 7. Record the sent link
-                storage.add_sent_link(link, clean_title)
-                new_articles_sent += 1
+        # 5. Look up all candidate links in one batched query
+        sent_links = storage.get_sent_links(item.link for item in filtered_news)
+
+        # Process older items first so notifications are dispatched in chronological order
+        new_items = []
+        for item in reversed(filtered_news):
+            if item.link in sent_links:
+                logger.trace("Article already sent, skipping: '{}'", item.title)
             else:
-                logger.trace(f"Article already sent, skipping: '{item['title']}'")
+                new_items.append(item)
 
-        if new_articles_sent == 0:
+        if not new_items:
             logger.info("No new articles to send.")
+            return
+
+        import telegram
+        from src import notifier
+
+        # All messages go to one chat, so they share one rate limiter.
+        # 'send_interval' in the telegram config overrides the spacing chosen from the chat type.
+        send_interval = telegram_conf.get('send_interval')
+        if send_interval is None:
+            send_interval = notifier.send_interval_for_chat(telegram_conf['chat_id'])
+        limiter = notifier.ChatRateLimiter(float(send_interval))
+
+        async def send(bot, item):
+            result = await notifier.send_notification(
+                bot=bot,
+                chat_id=telegram_conf['chat_id'],
+                news_item=item,
+                keyword=item.keyword, # Pass the keyword for highlighting
+                limiter=limiter
+            )
+            # 7. Record the link right away so a killed or overlapping run does not re-send it.
+            # Permanent failures are recorded too so they are not retried on every run;
+            # only temporary failures are left for the next run.
+            if result is not notifier.SendResult.RETRY:
+                storage.add_sent_link(item.link, notifier.clean_title(item.title))
+                storage.commit()
+            return result
+
+        # 6. Send notifications, spaced out to respect the per-chat rate limit.
+        # Build the bot once so all notifications share its HTTP connection pool
+        async with telegram.Bot(token=telegram_conf['bot_token']) as bot:
+            for item in new_items:
+                logger.info(f"New article found: '{notifier.clean_title(item.title)}'. Sending notification...")
+            results = await asyncio.gather(*(send(bot, item) for item in new_items))
+
+        sent_count = results.count(notifier.SendResult.SENT)
+        failed_count = results.count(notifier.SendResult.FAILED)
+        retry_count = results.count(notifier.SendResult.RETRY)
+        if sent_count == 0:
+            logger.info("No new articles were sent.")
         else:
-            logger.info(f"Finished sending {new_articles_sent} new articles.")
+            logger.info(f"Finished sending {sent_count} of {len(new_items)} new articles.")
+        if failed_count:
+            logger.warning(f"{failed_count} articles failed permanently and will not be retried.")
+        if retry_count:
+            logger.warning(f"{retry_count} articles failed temporarily and will be retried on the next run.")
 
     except Exception as e:
         logger.critical(f"A critical error occurred in the main pipeline: {e}", exc_info=True)
+    finally:
+        storage.close_database()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,31 +1,121 @@
-import requests
+import aiohttp
+import asyncio
 from loguru import logger
-from typing import List, Dict, Optional
+from typing import List, Optional
 from urllib.parse import urlparse, parse_qs
 import json
 import os
+import time
+
+from src.models import NewsItem
+
+try:
+    # orjson parses the response bytes directly and is much faster than json
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 # --- Constants and Global Cache ---
 
 NAVER_API_URL = "https://openapi.naver.com/v1/search/news.json"
 
+# Maximum number of concurrent requests to the Naver API.
+MAX_CONCURRENT_REQUESTS = 8
+
+# Retry policy for rate-limited (429) and server error (5xx) responses.
+MAX_RETRIES = 3
+MAX_BACKOFF_SECONDS = 30
+
+
+class NaverRateLimiter:
+    """
+    Caps concurrent Naver API requests and holds back new ones when the API
+    signals that the quota is exhausted.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_REQUESTS):
+        self.sem = asyncio.Semaphore(max_concurrency)
+        self._resume_at = 0.0  # Event loop time before which no request should start
+
+    def pause(self, seconds: float):
+        """Delays all requests that start within the next `seconds`."""
+        loop = asyncio.get_running_loop()
+        self._resume_at = max(self._resume_at, loop.time() + seconds)
+
+    async def wait(self):
+        """Sleeps until any pause requested by the API has elapsed."""
+        delay = self._resume_at - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update(self, headers):
+        """Pauses until the quota resets if the rate-limit headers report none left."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            if int(remaining) > 0:
+                return
+            reset_seconds = float(reset)
+        except ValueError:
+            return
+        # The reset value may be either a delay in seconds or a Unix timestamp.
+        if reset_seconds > 1e9:
+            reset_seconds -= time.time()
+        if reset_seconds > 0:
+            self.pause(min(reset_seconds, MAX_BACKOFF_SECONDS))
+
+
+def _retry_delay(response: aiohttp.ClientResponse, attempt: int) -> float:
+    """Returns how long to wait before retrying, honouring Retry-After if present."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return min(MAX_BACKOFF_SECONDS, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return min(MAX_BACKOFF_SECONDS, 2**attempt)
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Creates the HTTP session shared by all fetch_news calls in a run.
+
+    The connection pool keeps connections to the Naver API alive between
+    keywords and is sized to the number of concurrent requests.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONCURRENT_REQUESTS, limit_per_host=MAX_CONCURRENT_REQUESTS
+    )
+    return aiohttp.ClientSession(connector=connector)
+
 # --- Core Fetcher Logic ---
 
 
-def fetch_news(
-    client_id: str, client_secret: str, query: str, display: int = 10
-) -> Optional[List[Dict]]:
+async def fetch_news(
+    session: aiohttp.ClientSession,
+    limiter: NaverRateLimiter,
+    client_id: str,
+    client_secret: str,
+    query: str,
+    display: int = 10,
+) -> Optional[List[NewsItem]]:
     """
-    Fetches news articles from the Naver Search API.
+    Fetches news articles from the Naver Search API asynchronously.
+
+    Rate-limited (429) and server error (5xx) responses are retried with
+    exponential backoff, up to MAX_RETRIES times.
 
     Args:
+        session: The aiohttp session shared across all keyword fetches.
+        limiter: The rate limiter shared across all keyword fetches.
         client_id: Your Naver API client ID.
         client_secret: Your Naver API client secret.
         query: The search query (keyword).
         display: The number of news items to retrieve (default is 10).
 
     Returns:
-        A list of news item dictionaries, or None if an error occurs.
+        A list of news items, or None if an error occurs.
     """
     headers = {
         "X-Naver-Client-Id": client_id,
@@ -39,16 +129,51 @@ def fetch_news(
     }
 
     try:
-        response = requests.get(
-            NAVER_API_URL, headers=headers, params=params, timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
+        for attempt in range(MAX_RETRIES + 1):
+            async with limiter.sem:
+                await limiter.wait()
+                async with session.get(
+                    NAVER_API_URL,
+                    headers=headers,
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=10),
+                ) as response:
+                    limiter.update(response.headers)
+                    status = response.status
+                    retryable = status == 429 or status >= 500
+                    if retryable and attempt < MAX_RETRIES:
+                        delay = _retry_delay(response, attempt)
+                    elif status >= 400:
+                        body = await response.text()
+                        logger.error(
+                            f"HTTP error occurred: {status} {response.reason} - Response: {body}"
+                        )
+                        return None
+                    else:
+                        data = _json_loads(await response.read())
+                        break
+
+            logger.warning(
+                f"HTTP {status} for query: '{query}'. Retrying in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{MAX_RETRIES})"
+            )
+            if status == 429:
+                # Rate limiting applies to every query, so hold back all of them
+                limiter.pause(delay)
+            else:
+                await asyncio.sleep(delay)
 
         if "items" in data:
-            news_items = data["items"]
-            for item in news_items:
-                item["keyword"] = query
+            news_items = [
+                NewsItem(
+                    title=item["title"],
+                    description=item["description"],
+                    link=item["link"],
+                    pub_date=item.get("pubDate"),
+                    keyword=query,
+                )
+                for item in data["items"]
+            ]
 
             logger.info(
                 f"Successfully fetched {len(news_items)} news items for query: '{query}'"
@@ -60,9 +185,9 @@ def fetch_news(
             )
             return []
 
-    except requests.exceptions.HTTPError as http_err:
-        logger.error(f"HTTP error occurred: {http_err} - Response: {response.text}")
-    except requests.exceptions.RequestException as req_err:
+    except asyncio.TimeoutError:
+        logger.error(f"Request timed out for query: '{query}'")
+    except aiohttp.ClientError as req_err:
         logger.error(f"Request error occurred: {req_err}")
     except Exception as e:
         logger.error(f"An unexpected error occurred in fetch_news: {e}")
@@ -73,6 +198,7 @@ def fetch_news(
 # --- Test Execution Block ---
 
 if __name__ == "__main__":
+    # Run from the project root: python -m src.fetcher
     import yaml
 
     logger.info("Running fetcher.py directly for testing.")
@@ -95,14 +221,22 @@ if __name__ == "__main__":
             )
         else:
             logger.info(f"Testing with query: '{test_query}'")
-            news_items = fetch_news(client_id, client_secret, test_query)
+
+            async def test_run():
+                async with create_session() as session:
+                    limiter = NaverRateLimiter()
+                    return await fetch_news(
+                        session, limiter, client_id, client_secret, test_query
+                    )
+
+            news_items = asyncio.run(test_run())
 
             if news_items is not None:
                 logger.info(f"Found {len(news_items)} articles.")
                 for i, item in enumerate(news_items[:2]):
-                    logger.info(f"      Keyword: {item.get('keyword', 'N/A')}")
-                    logger.info(f"      Title: {item['title']}")
-                    logger.info(f"      Link: {item['link']}")
+                    logger.info(f"      Keyword: {item.keyword or 'N/A'}")
+                    logger.info(f"      Title: {item.title}")
+                    logger.info(f"      Link: {item.link}")
             else:
                 logger.error("Failed to fetch news from Naver API.")
 
@@ -1,16 +1,39 @@
-from typing import List, Dict
+from typing import Callable, List
 from loguru import logger
 
+from src.models import NewsItem
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+def _build_matcher(keywords: List[str]) -> Callable[[str], bool]:
+    """
+    Builds a function that tells whether any of the keywords occurs in a text.
+
+    Uses a single-pass Aho-Corasick automaton when pyahocorasick is installed,
+    otherwise falls back to plain substring checks.
+    """
+    if ahocorasick is None or not keywords or not all(keywords):
+        return lambda text: any(kw in text for kw in keywords)
+
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return lambda text: next(automaton.iter(text), None) is not None
+
 def filter_news(
-    news_items: List[Dict], 
+    news_items: List[NewsItem], 
     include_keywords: List[str], 
     exclude_keywords: List[str]
-) -> List[Dict]:
+) -> List[NewsItem]:
     """
     Filters a list of news articles based on keywords.
 
     Args:
-        news_items: A list of news item dictionaries from the fetcher.
+        news_items: A list of news items from the fetcher.
         include_keywords: A list of keywords that MUST be present in the title or description.
                           The logic is OR-based; any one of these keywords is a match.
         exclude_keywords: A list of keywords that MUST NOT be present in the title or description.
@@ -23,15 +46,17 @@ def filter_news(
 
     filtered_list = []
     
-    # Normalize keywords to lowercase for case-insensitive matching
-    include_keywords_lower = [kw.lower() for kw in include_keywords]
-    exclude_keywords_lower = [kw.lower() for kw in exclude_keywords]
+    # Normalize keywords with casefold for case-insensitive matching
+    include_keywords_lower = [kw.casefold() for kw in include_keywords]
+    exclude_keywords_lower = [kw.casefold() for kw in exclude_keywords]
+    matches_include = _build_matcher(include_keywords_lower)
+    matches_exclude = _build_matcher(exclude_keywords_lower)
 
     for item in news_items:
-        # Combine title and description for searching
-        title = item.get('title', '').lower()
-        description = item.get('description', '').lower()
-        content_to_search = f"{title} {description}"
+        # Title and description are searched separately, title first,
+        # so a title hit skips scanning the description.
+        title = item.title.casefold()
+        description = item.description.casefold()
         
         # 1. Check for inclusion criteria (OR logic)
         # If there are inclusion keywords, at least one must be met.
@@ -39,7 +64,7 @@ def filter_news(
         if not include_keywords_lower:
             passes_include = True  # No include keywords means all items pass this check
         else:
-            if any(kw in content_to_search for kw in include_keywords_lower):
+            if matches_include(title) or matches_include(description):
                 passes_include = True
         
         if not passes_include:
@@ -49,11 +74,11 @@ def filter_news(
         # If any exclusion keyword is found, the item is rejected.
         passes_exclude = True
         if exclude_keywords_lower:
-            if any(kw in content_to_search for kw in exclude_keywords_lower):
+            if matches_exclude(title) or matches_exclude(description):
                 passes_exclude = False
         
         if not passes_exclude:
-            logger.trace(f"Excluding '{item['title']}' due to exclusion keyword.")
+            logger.trace("Excluding '{}' due to exclusion keyword.", item.title)
             continue # Skip to the next item if exclusion criteria are met
             
         # 3. If both checks pass, add to the list
@@ -63,16 +88,17 @@ def filter_news(
     return filtered_list
 
 if __name__ == '__main__':
+    # Run from the project root: python -m src.filter
     logger.info("Running filter.py directly for testing.")
     
     # Test Data
     mock_news = [
-        {'title': '새로운 차별금지법안 발의', 'description': '국회에서 중요한 법안이 논의됩니다.'},
-        {'title': '스포츠 뉴스: 손흥민 득점', 'description': '프리미어리그 소식입니다.'},
-        {'title': '속보: 트랜스젠더 인권 보호 시급', 'description': '시민 단체 촉구.'},
-        {'title': '광고 상품 안내', 'description': '이것은 광고입니다.'},
-        {'title': '차별금지법, 찬반 논쟁 (광고 포함)', 'description': '의견이 분분합니다.'},
-        {'title': '날씨 정보', 'description': '전국이 맑겠습니다.'},
+        NewsItem(title='새로운 차별금지법안 발의', description='국회에서 중요한 법안이 논의됩니다.', link=''),
+        NewsItem(title='스포츠 뉴스: 손흥민 득점', description='프리미어리그 소식입니다.', link=''),
+        NewsItem(title='속보: 트랜스젠더 인권 보호 시급', description='시민 단체 촉구.', link=''),
+        NewsItem(title='광고 상품 안내', description='이것은 광고입니다.', link=''),
+        NewsItem(title='차별금지법, 찬반 논쟁 (광고 포함)', description='의견이 분분합니다.', link=''),
+        NewsItem(title='날씨 정보', description='전국이 맑겠습니다.', link=''),
     ]
     
     # Test Keywords from user's example
@@ -87,8 +113,8 @@ if __name__ == '__main__':
     
     # Assertions to verify the logic
     assert len(filtered_results) == 2, f"Expected 2 results, but got {len(filtered_results)}"
-    assert filtered_results[0]['title'] == '새로운 차별금지법안 발의'
-    assert filtered_results[1]['title'] == '속보: 트랜스젠더 인권 보호 시급'
+    assert filtered_results[0].title == '새로운 차별금지법안 발의'
+    assert filtered_results[1].title == '속보: 트랜스젠더 인권 보호 시급'
 
     # Test with no include keywords
     filtered_no_include = filter_news(mock_news, [], exclude_kws)
@@ -102,4 +128,4 @@ if __name__ == '__main__':
     
     logger.info("filter.py test completed successfully.")
     for item in filtered_results:
-        logger.info(f"  - Passed: {item['title']}")
+        logger.info(f"  - Passed: {item.title}")
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class NewsItem:
+    """
+    A news article returned by the Naver Search API.
+
+    Attributes:
+        title: The article title, with search keywords wrapped in <b> tags.
+        description: A short summary of the article, also with <b> tags.
+        link: The URL of the article.
+        pub_date: The RFC 1123 publication date (e.g., "Fri, 09 Jan 2026 07:26:38 +0900").
+        keyword: The search keyword that returned this article.
+    """
+
+    title: str
+    description: str
+    link: str
+    pub_date: Optional[str] = None
+    keyword: Optional[str] = None
@@ -1,53 +1,187 @@
 import telegram
 from telegram.constants import ParseMode
 from loguru import logger
-from typing import Dict
+from typing import Dict, Optional, Tuple
 import html
+import re
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
+from enum import Enum
+
+from src.models import NewsItem
+
+# All notifications go to a single chat, so sends are spaced out to respect Telegram's
+# per-chat limits: about 1 message/s for private chats and 20 messages/min for groups and channels.
+PRIVATE_CHAT_SEND_INTERVAL_SECONDS = 1.0
+GROUP_CHAT_SEND_INTERVAL_SECONDS = 3.0
+
+# How many times a message is tried when Telegram answers with RetryAfter.
+MAX_SEND_ATTEMPTS = 3
+
+
+class SendResult(Enum):
+    """Outcome of a send_notification call."""
+
+    SENT = "sent"
+    # Failed in a way that retrying will not fix, or the message may already have been delivered
+    FAILED = "failed"
+    # Failed for any other reason; worth retrying on a later run
+    RETRY = "retry"
+
+
+def send_interval_for_chat(chat_id) -> float:
+    """
+    Returns the spacing between messages for a chat.
+    Private chats have positive numeric IDs; groups and channels have negative IDs or '@username'.
+    """
+    try:
+        is_private = int(chat_id) > 0
+    except (TypeError, ValueError):
+        is_private = False
+    if is_private:
+        return PRIVATE_CHAT_SEND_INTERVAL_SECONDS
+    return GROUP_CHAT_SEND_INTERVAL_SECONDS
+
+
+class ChatRateLimiter:
+    """
+    Spaces out the start of messages to a single Telegram chat and holds back all of
+    them after Telegram asks to slow down. Send slots are handed out in call order;
+    a message may start while the previous one is still in flight.
+    """
+
+    def __init__(self, interval: float = GROUP_CHAT_SEND_INTERVAL_SECONDS):
+        self._interval = interval
+        self._next_at = 0.0  # Event loop time of the next free send slot
+        self._paused_until = 0.0  # Event loop time before which no message may start
+        self._epoch = 0  # Bumped by pause() to invalidate slots reserved before it
+
+    def pause(self, seconds: float):
+        """Delays all messages, including ones already waiting, by `seconds` from now."""
+        loop = asyncio.get_running_loop()
+        self._paused_until = max(self._paused_until, loop.time() + seconds)
+        self._next_at = self._paused_until
+        self._epoch += 1
+
+    async def wait(self):
+        """Reserves the next send slot and sleeps until it arrives."""
+        loop = asyncio.get_running_loop()
+        while True:
+            epoch = self._epoch
+            now = loop.time()
+            start = max(now, self._next_at)
+            self._next_at = start + self._interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            # A pause requested while sleeping invalidates the slot; reserve a new one
+            if self._epoch == epoch:
+                return
+
+# Matches the <b> and </b> tags Naver uses to highlight search keywords.
+_BTAG_RE = re.compile(r"</?b>")
+
+
+def clean_title(title: str) -> str:
+    """Removes <b> highlighting tags from a news title in a single pass."""
+    return _BTAG_RE.sub("", title)
+
+
+# Compiled case-insensitive patterns for keyword highlighting, keyed by keyword.
+# Each entry holds (pattern for the already-bolded keyword, pattern for the keyword).
+_KW_RE_CACHE: Dict[str, Tuple[re.Pattern, re.Pattern]] = {}
+
+
+def _kw_re(keyword: str) -> Tuple[re.Pattern, re.Pattern]:
+    """Returns the cached highlighting patterns for a keyword, compiling them on first use."""
+    patterns = _KW_RE_CACHE.get(keyword)
+    if patterns is None:
+        escaped = re.escape(keyword)
+        patterns = _KW_RE_CACHE[keyword] = (
+            re.compile(f"<b>{escaped}</b>", re.IGNORECASE),
+            re.compile(f"({escaped})", re.IGNORECASE),
+        )
+    return patterns
+
+
+# Month abbreviations used in RFC 1123 dates.
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+
+def _format_pub_date(pub_date: str) -> str:
+    """
+    Formats an RFC 1123 date string (e.g., "Fri, 09 Jan 2026 07:26:38 +0900")
+    as a Korean date, keeping the time in the string's own offset.
+
+    The fixed-width layout is sliced directly; anything else falls back to strptime.
+    """
+    try:
+        if len(pub_date) != 31 or pub_date[19] != ":":
+            raise ValueError("not a fixed-width RFC 1123 date")
+        year = int(pub_date[12:16])
+        month = _MONTHS[pub_date[8:11]]
+        day = int(pub_date[5:7])
+        hour = int(pub_date[17:19])
+        minute = int(pub_date[20:22])
+    except (ValueError, KeyError):
+        dt_object = datetime.strptime(pub_date, "%a, %d %b %Y %H:%M:%S %z")
+        year, month, day = dt_object.year, dt_object.month, dt_object.day
+        hour, minute = dt_object.hour, dt_object.minute
+    return f"{year}년 {month}월 {day}일 {hour}시 {minute}분"
 
 
 async def send_notification(
-    bot_token: str, chat_id: str, news_item: Dict, keyword: str
-):
+    bot: telegram.Bot,
+    chat_id: str,
+    news_item: NewsItem,
+    keyword: str,
+    limiter: Optional[ChatRateLimiter] = None,
+) -> SendResult:
     """
     Sends a formatted news notification to a Telegram chat asynchronously.
+    If Telegram asks to slow down (RetryAfter), the limiter is paused for the requested
+    delay and the message is retried, up to MAX_SEND_ATTEMPTS times in total.
 
     Args:
-        bot_token: The Telegram Bot API token.
+        bot: The Telegram bot, shared across notifications to reuse its connection pool.
         chat_id: The target chat ID.
-        news_item: The news article dictionary to send.
+        news_item: The news article to send.
         keyword: The search keyword, to be bolded in the title.
+        limiter: The rate limiter shared across notifications to the same chat.
+
+    Returns:
+        SendResult.SENT if the message was sent, SendResult.FAILED if Telegram rejected it
+        (BadRequest) or timed out, since the message may already have been delivered, and
+        SendResult.RETRY for any other error.
     """
-    try:
-        bot = telegram.Bot(token=bot_token)
+    if limiter is None:
+        limiter = ChatRateLimiter(send_interval_for_chat(chat_id))
 
+    try:
         # The Naver API provides HTML tags (<b>) for keywords. We use HTML parsing.
         # html.unescape is used to decode entities like &quot; into ".
         # Keep <b> tags for bolding keywords, and unescape HTML entities.
-        title = html.unescape(news_item["title"])
-        description = html.unescape(news_item["description"])
-        link = news_item["link"]
-        pub_date = news_item.get("pubDate")
+        title = html.unescape(news_item.title)
+        description = html.unescape(news_item.description)
+        link = news_item.link
+        pub_date = news_item.pub_date
 
         # Format the publication date if it exists
         formatted_date = ""
         if pub_date:
             try:
-                # Parse RFC 1123 date string (e.g., "Fri, 09 Jan 2026 07:26:38 +0900")
-                dt_object = datetime.strptime(pub_date, '%a, %d %b %Y %H:%M:%S %z')
-                formatted_date = f"{dt_object.year}년 {dt_object.month}월 {dt_object.day}일 {dt_object.hour}시 {dt_object.minute}분"
+                formatted_date = _format_pub_date(pub_date)
             except (ValueError, KeyError) as e:
                 logger.warning(f"Could not parse date '{pub_date}': {e}")
 
         # This is a fallback and might not be perfect if the title was modified.
-        if keyword and f"<b>{keyword}</b>" not in title.lower():
-            # A simple case-insensitive replace
-            import re
-
-            title = re.sub(
-                f"({re.escape(keyword)})", r"<b>\1</b>", title, flags=re.IGNORECASE
-            )
+        if keyword:
+            bolded_re, keyword_re = _kw_re(keyword)
+            if not bolded_re.search(title):
+                # A simple case-insensitive replace
+                title = keyword_re.sub(r"<b>\1</b>", title)
 
         # Format the message using HTML tags, including the formatted date if available.
         message_parts = [f"<b>{title}</b>"]
@@ -58,26 +192,52 @@ async def send_notification(
 
         message = "\n\n".join(message_parts)
 
-        await bot.send_message(
-            chat_id=chat_id,
-            text=message,
-            parse_mode=ParseMode.HTML,
-            disable_web_page_preview=False,
-        )
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            await limiter.wait()
+            try:
+                await bot.send_message(
+                    chat_id=chat_id,
+                    text=message,
+                    parse_mode=ParseMode.HTML,
+                    disable_web_page_preview=False,
+                )
+                break
+            except telegram.error.RetryAfter as e:
+                if attempt == MAX_SEND_ATTEMPTS:
+                    raise
+                # Depending on the library version, retry_after is seconds or a timedelta
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+                logger.warning(
+                    f"Telegram rate limit hit. Retrying in {retry_after}s "
+                    f"(attempt {attempt}/{MAX_SEND_ATTEMPTS})..."
+                )
+                # The limit applies to the whole chat, so hold back every pending message
+                limiter.pause(retry_after)
 
         # Use a cleaned title for logging to avoid messy logs.
-        clean_title = title.replace("<b>", "").replace("</b>", "")
-        logger.info(f"Notification sent successfully for: {clean_title}")
+        logger.info(f"Notification sent successfully for: {clean_title(title)}")
+        return SendResult.SENT
 
-    except telegram.error.TelegramError as e:
+    # Only these are permanent; every other error leaves the article for the next run
+    except (telegram.error.BadRequest, telegram.error.TimedOut) as e:
         logger.error(f"Telegram error occurred: {e}")
-        logger.error(f"Failed to send notification for: {news_item.get('title')}")
+        logger.error(f"Failed to send notification for: {news_item.title}")
+        return SendResult.FAILED
+    except telegram.error.TelegramError as e:
+        logger.warning(f"Telegram error occurred: {e}")
+        logger.warning(f"Will retry notification on the next run for: {news_item.title}")
     except Exception as e:
+        # Unexpected errors (e.g. a formatting bug) must not mark the article as handled
         logger.error(f"An unexpected error occurred in send_notification: {e}")
+        logger.error(f"Will retry notification on the next run for: {news_item.title}")
+
+    return SendResult.RETRY
 
 
 if __name__ == "__main__":
-    # Example usage:
+    # Example usage (from the project root): python -m src.notifier
     # To test this, you need to have a config.yaml file in the ../config directory
     # with your actual Telegram bot token and chat ID.
     import yaml
@@ -108,15 +268,16 @@ if __name__ == "__main__":
                 )
             else:
                 # Mock news item for testing
-                mock_item = {
-                    "title": "<b>테스트 뉴스</b>: 봇 작동 확인",
-                    "description": "이 메시지는 notifier.py에서 직접 보낸 <b>테스트</b> 알림입니다.",
-                    "link": "https://www.google.com",
-                }
+                mock_item = NewsItem(
+                    title="<b>테스트 뉴스</b>: 봇 작동 확인",
+                    description="이 메시지는 notifier.py에서 직접 보낸 <b>테스트</b> 알림입니다.",
+                    link="https://www.google.com",
+                )
                 test_keyword = "테스트"
 
                 logger.info("Sending a test notification to your Telegram chat...")
-                await send_notification(bot_token, chat_id, mock_item, test_keyword)
+                async with telegram.Bot(token=bot_token) as bot:
+                    await send_notification(bot, chat_id, mock_item, test_keyword)
                 logger.info("Test notification sent. Please check your Telegram chat.")
 
         except FileNotFoundError:
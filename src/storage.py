@@ -1,12 +1,57 @@
 import sqlite3
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Iterable, Set, Tuple
 from loguru import logger
 
 # Set the database path relative to the project structure
 # The DB will be created in the 'data' directory.
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'sent_news.db')
 
+# Sent links not seen in a fetch for this long are pruned from the database.
+RETENTION_DAYS = 90
+
+# Stay below SQLite's default limit on the number of bound parameters per query.
+MAX_QUERY_PARAMS = 900
+
+# A single connection is opened lazily and reused for the whole run.
+_conn = None
+
+def _get_conn() -> sqlite3.Connection:
+    """
+    Returns the shared database connection, opening it on first use.
+    """
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _conn.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA cache_size=-65536;"
+            "PRAGMA mmap_size=268435456;"
+        )
+    return _conn
+
+def commit():
+    """
+    Commits pending writes on the shared connection.
+    """
+    try:
+        if _conn is not None:
+            _conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Error committing to database: {e}")
+
+def close_database():
+    """
+    Commits pending writes and closes the shared connection.
+    """
+    global _conn
+    if _conn is not None:
+        commit()
+        _conn.close()
+        _conn = None
+
 def setup_database():
     """
     Ensures the database and the 'sent_news' table exist.
@@ -15,20 +60,19 @@ def setup_database():
         # Ensure the data directory exists
         os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
         
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+        conn = _get_conn()
         
         # Create table if it doesn't exist
-        cursor.execute('''
+        conn.execute('''
             CREATE TABLE IF NOT EXISTS sent_news (
                 link TEXT PRIMARY KEY,
                 title TEXT NOT NULL,
                 sent_at TIMESTAMP NOT NULL
-            )
+            ) WITHOUT ROWID
         ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_sent_at ON sent_news (sent_at)")
         
         conn.commit()
-        conn.close()
         logger.info(f"Database setup complete. Path: {DB_PATH}")
     except sqlite3.Error as e:
         logger.error(f"Database error during setup: {e}")
@@ -45,45 +89,124 @@ def is_link_sent(link: str) -> bool:
         True if the link exists in the database, False otherwise.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT 1 FROM sent_news WHERE link = ?", (link,))
+        cursor = _get_conn().execute("SELECT 1 FROM sent_news WHERE link = ?", (link,))
         result = cursor.fetchone()
-        
-        conn.close()
         return result is not None
     except sqlite3.Error as e:
         logger.error(f"Error checking link in database: {e}")
         # In case of error, assume it was sent to avoid duplicates
         return True
 
+def touch_sent_links(links: Iterable[str]):
+    """
+    Refreshes `sent_at` for links that are already stored, using batched queries.
+
+    Called with every fetched link, so `sent_at` works as a last-seen time and
+    articles Naver still returns are never pruned. Unknown links are ignored.
+
+    Args:
+        links: The URLs of the news articles returned by the current fetch.
+    """
+    links = list(links)
+    try:
+        conn = _get_conn()
+        seen_at = datetime.now()
+        for start in range(0, len(links), MAX_QUERY_PARAMS):
+            batch = links[start:start + MAX_QUERY_PARAMS]
+            placeholders = ','.join('?' * len(batch))
+            conn.execute(
+                f"UPDATE sent_news SET sent_at = ? WHERE link IN ({placeholders})",
+                [seen_at, *batch]
+            )
+        conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Error refreshing links in database: {e}")
+
+def prune_sent_links(days: int = RETENTION_DAYS):
+    """
+    Deletes sent links last seen more than `days` days ago.
+    Call `touch_sent_links` with the current fetch results first.
+
+    Args:
+        days: How many days of sent links to keep.
+    """
+    try:
+        cutoff = datetime.now() - timedelta(days=days)
+        conn = _get_conn()
+        cursor = conn.execute("DELETE FROM sent_news WHERE sent_at < ?", (cutoff,))
+        conn.commit()
+        if cursor.rowcount:
+            logger.info(f"Pruned {cursor.rowcount} links not seen for {days} days from DB.")
+    except sqlite3.Error as e:
+        logger.error(f"Error pruning old links from database: {e}")
+
+def get_sent_links(links: Iterable[str]) -> Set[str]:
+    """
+    Returns which of the given links have already been sent, using batched queries.
+
+    Args:
+        links: The URLs of the news articles to check.
+
+    Returns:
+        The subset of `links` that exist in the database.
+    """
+    links = list(links)
+    sent = set()
+    try:
+        conn = _get_conn()
+        for start in range(0, len(links), MAX_QUERY_PARAMS):
+            batch = links[start:start + MAX_QUERY_PARAMS]
+            placeholders = ','.join('?' * len(batch))
+            cursor = conn.execute(
+                f"SELECT link FROM sent_news WHERE link IN ({placeholders})", batch
+            )
+            sent.update(row[0] for row in cursor.fetchall())
+        return sent
+    except sqlite3.Error as e:
+        logger.error(f"Error checking links in database: {e}")
+        # In case of error, assume all were sent to avoid duplicates
+        return set(links)
+
 def add_sent_link(link: str, title: str):
     """
     Adds a sent news article link to the database.
+    The write is not committed until `commit()` is called.
 
     Args:
         link: The URL of the news article.
         title: The title of the news article.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         sent_at = datetime.now()
-        cursor.execute(
-            "INSERT INTO sent_news (link, title, sent_at) VALUES (?, ?, ?)",
+        cursor = _get_conn().execute(
+            "INSERT OR IGNORE INTO sent_news (link, title, sent_at) VALUES (?, ?, ?)",
             (link, title, sent_at)
         )
-        
-        conn.commit()
-        conn.close()
-        logger.info(f"Added to DB: {title}")
-    except sqlite3.IntegrityError:
-        logger.warning(f"Link already exists in DB (IntegrityError): {link}")
+        if cursor.rowcount == 0:
+            logger.warning(f"Link already exists in DB: {link}")
+        else:
+            logger.info(f"Added to DB: {title}")
     except sqlite3.Error as e:
         logger.error(f"Error adding link to database: {e}")
 
+def add_sent_links(entries: Iterable[Tuple[str, str]]):
+    """
+    Adds several sent news article links to the database in one batch.
+    Links that already exist are ignored. The writes are not committed until `commit()` is called.
+
+    Args:
+        entries: (link, title) pairs of the sent news articles.
+    """
+    try:
+        sent_at = datetime.now()
+        cursor = _get_conn().executemany(
+            "INSERT OR IGNORE INTO sent_news (link, title, sent_at) VALUES (?, ?, ?)",
+            ((link, title, sent_at) for link, title in entries)
+        )
+        logger.info(f"Added {cursor.rowcount} links to DB.")
+    except sqlite3.Error as e:
+        logger.error(f"Error adding links to database: {e}")
+
 if __name__ == '__main__':
     # Example usage and testing
     logger.info("Running storage.py directly for testing.")
@@ -99,11 +222,9 @@ if __name__ == '__main__':
     
     # 3. Clear old test data if it exists
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM sent_news WHERE link LIKE 'https://example.com/%'")
+        conn = _get_conn()
+        conn.execute("DELETE FROM sent_news WHERE link LIKE 'https://example.com/%'")
         conn.commit()
-        conn.close()
         logger.info("Cleared previous test data.")
     except sqlite3.Error as e:
         logger.error(f"Could not clear test data: {e}")
@@ -117,6 +238,9 @@ if __name__ == '__main__':
     # 5. Add link to DB
     add_sent_link(test_link1, test_title1)
     
+    # Adding the same link again is ignored
+    add_sent_link(test_link1, test_title1)
+
     # 6. Check again (should be True)
     is_sent = is_link_sent(test_link1)
     logger.info(f"Is '{test_link1}' sent again? {is_sent}")
@@ -126,5 +250,22 @@ if __name__ == '__main__':
     is_sent_2 = is_link_sent(test_link2)
     logger.info(f"Is '{test_link2}' sent? {is_sent_2}")
     assert not is_sent_2
+
+    # 8. Batched lookup returns only the links already stored
+    sent_links = get_sent_links([test_link1, test_link2])
+    logger.info(f"Already sent among both links: {sent_links}")
+    assert sent_links == {test_link1}
+
+    # 9. Batched insert skips links that are already stored
+    add_sent_links([(test_link1, test_title1), (test_link2, test_title2)])
+    assert get_sent_links([test_link1, test_link2]) == {test_link1, test_link2}
+
+    # 10. Links seen again are not pruned; links not seen for too long are
+    conn = _get_conn()
+    conn.execute("UPDATE sent_news SET sent_at = '2000-01-01 00:00:00' WHERE link LIKE 'https://example.com/%'")
+    touch_sent_links([test_link1])
+    prune_sent_links()
+    assert get_sent_links([test_link1, test_link2]) == {test_link1}
     
+    close_database()
     logger.info("storage.py test completed successfully.")